@@ -8,13 +8,28 @@ CLI questionnaire that stores each completed run as one JSON object per line (JS
 
 from __future__ import annotations
 import random
-import json
 import os
 from dataclasses import dataclass
 from typing import List, Dict, Any
 
+try:
+    import orjson
+
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    import json
+
+    # one shared encoder, compact like orjson
+    _encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def dumps(obj: Any) -> bytes:
+        return _encode(obj).encode("utf-8")
+
 
 LIKERT_OPTIONS = ["Strongly disagree", "Disagree", "Neutral", "Agree", "Strongly agree"]
+LIKERT_LINE = "  " + "  ".join(f"{i}) {opt}" for i, opt in enumerate(LIKERT_OPTIONS, start=1))
+LIKERT_INPUTS = {str(i): i for i in range(1, len(LIKERT_OPTIONS) + 1)}  # accepted input -> answer
 
 
 @dataclass(frozen=True)
@@ -69,24 +84,19 @@ def prompt_name() -> str:
 
 def prompt_likert(question: Question) -> int:
     print("\n" + question.text)
-    question_str = ""
-    for i, opt in enumerate(LIKERT_OPTIONS, start=1):
-        question_str += opt+" "
-    print(question_str)#f"  {i}) {opt}")
+    print(LIKERT_LINE)
 
     while True:
         raw = input("Select 1-5: ").strip()
-        if raw.isdigit():
-            val = int(raw)
-            if 1 <= val <= 5:
-                return val
+        if raw in LIKERT_INPUTS:
+            return LIKERT_INPUTS[raw]
         print("Invalid input. Please enter a number from 1 to 5.")
 
 
 def append_jsonl(path: str, obj: Dict[str, Any]) -> None:
     os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    with open(path, "ab") as f:
+        f.write(dumps(obj) + b"\n")
 
 def main() -> None:
     results_path = "resultdata.jsonl"
@@ -101,7 +111,6 @@ def main() -> None:
 
     record = {
         "id": random.randint(10000000, 99999999),
-        "sample": 1,
         "name": name,
         "answers": answers,
         "questionnaire_version": 1,
@@ -1,22 +1,47 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import json
 import math
+import multiprocessing
+import operator
 import os
-import statistics
-from collections import defaultdict, Counter
-from typing import Dict, Any, List, Tuple
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Iterator, List, Sequence, Tuple
 
+import matplotlib
+
+matplotlib.use("Agg")  # plots are only written to files; skip GUI backend setup
 import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+try:
+    from orjson import JSONDecodeError, loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    from json import JSONDecodeError, loads
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; compute_scores falls back to NumPy
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        return lambda fn: fn
 
 
 # ----------------------------
 # Config
 # ----------------------------
 
+plt.rcParams["figure.autolayout"] = True  # tight layout on every figure, applied at draw time
+
 RESULTS_PATH = "resultdata_longitudinal.jsonl"  # <- set this to your longitudinal file
 OUTPUT_DIR = "plots_aggregate"
+LOAD_CHUNK_ROWS = 50_000  # rows parsed into Python objects before being packed into arrays
+RESERVOIR_SIZE = 100_000  # max raw score rows kept per boxplot/hexbin sample
 
 # (qid, healthy_norm, contradictory_bool)
 QUESTIONS: List[Tuple[str, int, bool]] = [
@@ -54,24 +79,82 @@ QUESTIONS: List[Tuple[str, int, bool]] = [
 NORM: Dict[str, int] = {qid: norm for qid, norm, _ in QUESTIONS}
 IS_CONTRADICTORY: Dict[str, bool] = {qid: is_c for qid, _, is_c in QUESTIONS}
 QIDS: List[str] = [qid for qid, _, _ in QUESTIONS]
+QID_INDEX: Dict[str, int] = {qid: i for i, qid in enumerate(QIDS)}  # column of each qid in the answer matrix
+GET_ANSWERS = operator.itemgetter(*QIDS)  # answers dict -> tuple of values in QIDS order
+
+# The same tables as arrays in QIDS order, for the matrix scorers
+NORM_ARR = np.array([NORM[q] for q in QIDS], dtype=np.int8)
+CONTR_MASK = np.array([IS_CONTRADICTORY[q] for q in QIDS])
+ALL_IDX = np.arange(len(QIDS))
+CONTR_IDX = np.flatnonzero(CONTR_MASK)
+NONCONTR_IDX = np.flatnonzero(~CONTR_MASK)
 
 
 # ----------------------------
 # IO helpers
 # ----------------------------
 
-def read_jsonl(path: str) -> List[Dict[str, Any]]:
-    rows: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8") as f:
+def iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    # lines stay bytes, which loads parses without a str decode
+    with open(path, "rb") as f:
         for line_no, line in enumerate(f, start=1):
             line = line.strip()
             if not line:
                 continue
             try:
-                rows.append(json.loads(line))
-            except json.JSONDecodeError as e:
+                yield loads(line)
+            except JSONDecodeError as e:
                 raise ValueError(f"Invalid JSON on line {line_no}: {e}") from e
-    return rows
+
+
+def iter_row_chunks(path: str) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Yields (answers, weeks, profiles) for up to LOAD_CHUNK_ROWS scorable rows at a time:
+    answers is (n, len(QIDS)) int8 in QIDS order with 0 for missing/invalid,
+    weeks is (n,) int32 and profiles is (n,) object.
+    """
+    answer_rows: List[Sequence[int]] = []
+    weeks: List[int] = []
+    profiles: List[str] = []
+
+    def pack() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # turn the pending rows into arrays so only one chunk of dicts/lists is alive
+        chunk = (
+            np.array(answer_rows, dtype=np.int8).reshape(len(weeks), len(QIDS)),
+            np.array(weeks, dtype=np.int32),
+            np.array(profiles, dtype=object),
+        )
+        answer_rows.clear()
+        weeks.clear()
+        profiles.clear()
+        return chunk
+
+    for r in iter_jsonl(path):
+        if "name" not in r or "questionnaire_version" not in r:
+            continue
+        answers = r.get("answers", {})
+        if not isinstance(answers, dict):
+            continue
+        # fast path for complete rows of plain ints in 1..5: every check runs in C
+        try:
+            vals = GET_ANSWERS(answers)
+        except KeyError:
+            vals = None
+        if vals is not None and set(map(type, vals)) == {int} and 1 <= min(vals) and max(vals) <= 5:
+            answer_rows.append(vals)
+        else:
+            row = [0] * len(QIDS)
+            for qid, v in answers.items():
+                idx = QID_INDEX.get(qid)
+                if idx is not None and isinstance(v, int) and 1 <= v <= 5:
+                    row[idx] = v
+            answer_rows.append(row)
+        weeks.append(int(r["questionnaire_version"]))
+        profiles.append(str(r["name"]))
+        if len(weeks) >= LOAD_CHUNK_ROWS:
+            yield pack()
+    if weeks:
+        yield pack()
 
 
 def ensure_dir(path: str) -> None:
@@ -79,7 +162,6 @@ def ensure_dir(path: str) -> None:
 
 
 def savefig(path: str) -> None:
-    plt.tight_layout()
     plt.savefig(path, dpi=200)
     plt.close()
 
@@ -88,57 +170,110 @@ def savefig(path: str) -> None:
 # Scoring primitives
 # ----------------------------
 
-def abs_dev_from_norm(answers: Dict[str, int], qids: List[str]) -> float:
-    vals = []
-    for qid in qids:
-        v = answers.get(qid)
-        if isinstance(v, int) and 1 <= v <= 5:
-            vals.append(abs(v - NORM[qid]))
-    return float("nan") if not vals else sum(vals) / len(vals)
+# All scorers take an (N, len(QIDS)) int8 answer matrix in QIDS order, where
+# 0 marks a missing/invalid answer, and return one float per row (nan if the
+# row has no valid answers in the scored columns).
+
+def masked_row_mean(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    n = valid.sum(axis=1)
+    total = np.where(valid, values, 0).sum(axis=1)
+    return np.divide(total, n, out=np.full(len(n), np.nan), where=n > 0)
+
 
+def abs_dev_from_norm(answers: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    norm_vec = NORM_ARR[cols]
+    block = answers[:, cols]
+    return masked_row_mean(np.abs(block - norm_vec), block > 0)
 
-def extreme_direction_dev(answers: Dict[str, int], qids: List[str]) -> float:
+
+def extreme_direction_dev(answers: np.ndarray, cols: np.ndarray) -> np.ndarray:
     """
     Measures movement toward the "sick-extreme" direction:
     - If norm is 4/5: lower answers are more extreme (norm - answer)
     - If norm is 1/2: higher answers are more extreme (answer - norm)
     - If norm is 3: distance from 3 is extreme
     """
-    vals = []
-    for qid in qids:
-        norm = NORM[qid]
-        v = answers.get(qid)
-        if not (isinstance(v, int) and 1 <= v <= 5):
-            continue
-        if norm >= 4:
-            vals.append(max(0, norm - v))
-        elif norm <= 2:
-            vals.append(max(0, v - norm))
-        else:
-            vals.append(abs(v - 3))
-    return float("nan") if not vals else sum(vals) / len(vals)
-
+    norm_vec = NORM_ARR[cols]
+    direction = np.where(norm_vec >= 4, -1, np.where(norm_vec <= 2, 1, 0))
+    block = answers[:, cols]
+    dev = np.where(
+        norm_vec == 3,
+        np.abs(block - 3),
+        np.maximum(0, direction * (block - norm_vec)),
+    )
+    return masked_row_mean(dev, block > 0)
 
-def response_entropy(answers: Dict[str, int]) -> float:
-    vals = [v for v in answers.values() if isinstance(v, int) and 1 <= v <= 5]
-    if not vals:
-        return float("nan")
-    c = Counter(vals)
-    n = len(vals)
-    ent = 0.0
-    for cnt in c.values():
-        p = cnt / n
-        ent -= p * math.log2(p)
-    return ent
 
+def response_entropy(answers: np.ndarray) -> np.ndarray:
+    # one bincount over all rows: row i's answers land in bins [6*i, 6*i + 6)
+    n_rows = len(answers)
+    offsets = 6 * np.arange(n_rows, dtype=np.intp)[:, None]
+    counts = np.bincount((answers + offsets).ravel(), minlength=6 * n_rows).reshape(n_rows, 6)[:, 1:]
+    n = counts.sum(axis=1, keepdims=True)
+    p = np.divide(counts, n, out=np.zeros(counts.shape), where=n > 0)
+    plogp = p * np.log2(np.where(p > 0, p, 1.0))
+    return np.where(n[:, 0] > 0, -plogp.sum(axis=1), np.nan)
 
-def compute_scores(answers: Dict[str, int]) -> Dict[str, float]:
-    contr_qids = [q for q in QIDS if IS_CONTRADICTORY[q]]
-    noncontr_qids = [q for q in QIDS if not IS_CONTRADICTORY[q]]
 
-    dev_all = abs_dev_from_norm(answers, QIDS)
-    dev_contr = abs_dev_from_norm(answers, contr_qids)
-    dev_noncontr = abs_dev_from_norm(answers, noncontr_qids)
+@njit(cache=True, parallel=True)
+def _score_rows(answers: np.ndarray, norms: np.ndarray, contr: np.ndarray, out: np.ndarray) -> None:
+    """
+    Fused numba version of the scorers above: one pass per row fills
+    out[i] = (dev_all, extreme, dev_contr, dev_noncontr, entropy).
+    """
+    n_rows, n_questions = answers.shape
+    for i in prange(n_rows):
+        n_all = 0
+        n_contr = 0
+        sum_all = 0
+        sum_contr = 0
+        sum_extreme = 0
+        counts = np.zeros(6, dtype=np.int64)
+
+        for q in range(n_questions):
+            v = answers[i, q]
+            if v < 1 or v > 5:
+                continue
+            norm = norms[q]
+            dev = abs(v - norm)
+            n_all += 1
+            sum_all += dev
+            if contr[q]:
+                n_contr += 1
+                sum_contr += dev
+            if norm >= 4:
+                sum_extreme += max(0, norm - v)
+            elif norm <= 2:
+                sum_extreme += max(0, v - norm)
+            else:
+                sum_extreme += abs(v - 3)
+            counts[v] += 1
+
+        n_noncontr = n_all - n_contr
+        out[i, 0] = sum_all / n_all if n_all > 0 else np.nan
+        out[i, 1] = sum_extreme / n_all if n_all > 0 else np.nan
+        out[i, 2] = sum_contr / n_contr if n_contr > 0 else np.nan
+        out[i, 3] = (sum_all - sum_contr) / n_noncontr if n_noncontr > 0 else np.nan
+
+        entropy = 0.0
+        for k in range(1, 6):
+            if counts[k] > 0:
+                p = counts[k] / n_all
+                entropy -= p * np.log2(p)
+        out[i, 4] = entropy if n_all > 0 else np.nan
+
+
+def compute_scores(answers: np.ndarray) -> Dict[str, np.ndarray]:
+    if HAVE_NUMBA:
+        fused = np.empty((len(answers), 5))
+        _score_rows(answers, NORM_ARR, CONTR_MASK, fused)
+        dev_all, extreme, dev_contr, dev_noncontr, entropy = fused.T
+    else:
+        dev_all = abs_dev_from_norm(answers, ALL_IDX)
+        dev_contr = abs_dev_from_norm(answers, CONTR_IDX)
+        dev_noncontr = abs_dev_from_norm(answers, NONCONTR_IDX)
+        extreme = extreme_direction_dev(answers, ALL_IDX)
+        entropy = response_entropy(answers)
 
     # Your lying logic:
     # contradictory questions deviate, but non-contradictory do not.
@@ -146,9 +281,9 @@ def compute_scores(answers: Dict[str, int]) -> Dict[str, float]:
 
     return {
         "health_score": dev_all,
-        "extreme_score": extreme_direction_dev(answers, QIDS),
+        "extreme_score": extreme,
         "lie_score": lie_score,
-        "entropy": response_entropy(answers),
+        "entropy": entropy,
         "dev_contradictory": dev_contr,
         "dev_noncontradictory": dev_noncontr,
     }
@@ -158,34 +293,94 @@ def compute_scores(answers: Dict[str, int]) -> Dict[str, float]:
 # Flagging rules (aggregate)
 # ----------------------------
 
-def is_flag_sick(health_score: float, extreme_score: float) -> bool:
-    # Conservative defaults; tune after you see distributions
-    if math.isnan(health_score) or math.isnan(extreme_score):
-        return False
-    return (health_score >= 1.25) or (extreme_score >= 1.0)
+# Conservative defaults; tune after you see distributions
+SICK_HEALTH_MIN = 1.25
+SICK_EXTREME_MIN = 1.0
+LIE_SCORE_MIN = 0.60
+LIE_ENTROPY_MIN = 2.05
+
 
+# Both rules take scalars or whole score arrays; comparisons against nan are False,
+# so a missing score never raises a flag on its own.
+def is_flag_sick(health_score: np.ndarray, extreme_score: np.ndarray) -> np.ndarray:
+    both_valid = ~(np.isnan(health_score) | np.isnan(extreme_score))
+    return both_valid & ((health_score >= SICK_HEALTH_MIN) | (extreme_score >= SICK_EXTREME_MIN))
 
-def is_flag_lying(lie_score: float, entropy: float) -> bool:
-    # Conservative defaults; tune after you see distributions
-    if math.isnan(lie_score):
-        return False
-    return (lie_score >= 0.60) or (not math.isnan(entropy) and entropy >= 2.05)
+
+def is_flag_lying(lie_score: np.ndarray, entropy: np.ndarray) -> np.ndarray:
+    return (lie_score >= LIE_SCORE_MIN) | (~np.isnan(lie_score) & (entropy >= LIE_ENTROPY_MIN))
 
 
 # ----------------------------
-# Aggregate plotting helpers
+# Streaming aggregates
 # ----------------------------
 
-def mean_std(values: List[float]) -> Tuple[float, float]:
-    vals = [v for v in values if not math.isnan(v)]
-    if not vals:
-        return float("nan"), float("nan")
-    if len(vals) == 1:
-        return vals[0], 0.0
-    return statistics.mean(vals), statistics.stdev(vals)
+class RunningStats:
+    """
+    Count, mean and sum of squared deviations of a stream of values, merged one
+    chunk at a time (Welford / Chan et al.), so mean ± std never needs the raw
+    values. nan values are ignored.
+    """
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values: np.ndarray) -> None:
+        vals = values[~np.isnan(values)]
+        if vals.size == 0:
+            return
+        chunk_mean = float(vals.mean())
+        chunk_m2 = float(np.square(vals - chunk_mean).sum())
+        n = self.n + vals.size
+        delta = chunk_mean - self.mean
+        self.mean += delta * vals.size / n
+        self.m2 += chunk_m2 + delta * delta * self.n * vals.size / n
+        self.n = n
+
+    def mean_std(self) -> Tuple[float, float]:
+        if self.n == 0:
+            return float("nan"), float("nan")
+        if self.n == 1:
+            return self.mean, 0.0
+        return self.mean, math.sqrt(self.m2 / (self.n - 1))
+
+
+class Reservoir:
+    """
+    Uniform random sample of at most `size` rows from a stream of row chunks
+    (algorithm R). While fewer than `size` rows have been seen it holds all of
+    them, in order.
+    """
+
+    def __init__(self, size: int, width: int, rng: np.random.Generator) -> None:
+        self.rows = np.empty((size, width))
+        self.seen = 0
+        self.rng = rng
+
+    def update(self, rows: np.ndarray) -> None:
+        size = len(self.rows)
+        n_fill = max(0, min(size - self.seen, len(rows)))
+        self.rows[self.seen:self.seen + n_fill] = rows[:n_fill]
+        rest = rows[n_fill:]
+        if len(rest):
+            # the t-th row seen (1-based) replaces a random slot with probability size / t
+            t = self.seen + n_fill + np.arange(1, len(rest) + 1)
+            slot = self.rng.integers(0, t)
+            keep = slot < size
+            self.rows[slot[keep]] = rest[keep]
+        self.seen += len(rows)
 
+    def sample(self) -> np.ndarray:
+        return self.rows[:min(self.seen, len(self.rows))]
 
-def heatmap(matrix: List[List[float]], row_labels: List[str], col_labels: List[str], title: str, out_path: str) -> None:
+
+# ----------------------------
+# Aggregate plotting helpers
+# ----------------------------
+
+def heatmap(matrix: np.ndarray, row_labels: List[str], col_labels: List[str], title: str, out_path: str) -> None:
     plt.figure(figsize=(max(6, 0.75 * len(col_labels)), max(3, 0.55 * len(row_labels))))
     im = plt.imshow(matrix, aspect="auto")
     plt.colorbar(im, label="Mean score")
@@ -209,8 +404,9 @@ def line_with_error(
         means = [m for (m, s) in ms]
         stds = [s for (m, s) in ms]
         plt.plot(xs, means, marker="o", label=label)
-        lower = [m - s if not (math.isnan(m) or math.isnan(s)) else float("nan") for m, s in zip(means, stds)]
-        upper = [m + s if not (math.isnan(m) or math.isnan(s)) else float("nan") for m, s in zip(means, stds)]
+        # nan in either the mean or the std propagates to the band
+        lower = np.subtract(means, stds)
+        upper = np.add(means, stds)
         plt.fill_between(xs, lower, upper, alpha=0.15)
 
     plt.title(title)
@@ -220,9 +416,10 @@ def line_with_error(
     savefig(out_path)
 
 
-def boxplot_by_profile(values_by_profile: Dict[str, List[float]], title: str, ylabel: str, out_path: str) -> None:
+def boxplot_by_profile(values_by_profile: Dict[str, np.ndarray], title: str, ylabel: str, out_path: str) -> None:
     labels = sorted(values_by_profile.keys())
-    data = [[v for v in values_by_profile[l] if not math.isnan(v)] for l in labels]
+    data = [np.asarray(values_by_profile[l], dtype=np.float64) for l in labels]
+    data = [v[~np.isnan(v)] for v in data]
 
     plt.figure(figsize=(10, 5))
     plt.boxplot(data, labels=labels, showfliers=True)
@@ -232,9 +429,13 @@ def boxplot_by_profile(values_by_profile: Dict[str, List[float]], title: str, yl
     savefig(out_path)
 
 
-def hexbin_health_vs_lie(points: List[Tuple[float, float]], title: str, out_path: str) -> None:
-    xs = [p[0] for p in points if not (math.isnan(p[0]) or math.isnan(p[1]))]
-    ys = [p[1] for p in points if not (math.isnan(p[0]) or math.isnan(p[1]))]
+def hexbin_health_vs_lie(points: np.ndarray, title: str, out_path: str) -> None:
+    # points is (K, 2) of (health, lie); rows with a nan in either column are skipped
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    finite = np.isfinite(points).all(axis=1)
+    xs, ys = points[finite, 0], points[finite, 1]
+    if xs.size == 0:
+        return  # nothing to draw; don't write an empty figure
 
     plt.figure(figsize=(7, 6))
     plt.hexbin(xs, ys, gridsize=35, mincnt=1)
@@ -245,6 +446,11 @@ def hexbin_health_vs_lie(points: List[Tuple[float, float]], title: str, out_path
     savefig(out_path)
 
 
+def _render_hexbin(args: Tuple[np.ndarray, str, str]) -> None:
+    # top-level so ProcessPoolExecutor can pickle it
+    hexbin_health_vs_lie(*args)
+
+
 def stacked_flag_rates(
     weeks: List[int],
     profiles: List[str],
@@ -268,15 +474,12 @@ def stacked_flag_rates(
 # NEW: Confusion matrix + metrics
 # ----------------------------
 
-def update_confusion(conf: Dict[str, int], y_true: bool, y_pred: bool) -> None:
-    if y_true and y_pred:
-        conf["TP"] += 1
-    elif (not y_true) and y_pred:
-        conf["FP"] += 1
-    elif y_true and (not y_pred):
-        conf["FN"] += 1
-    else:
-        conf["TN"] += 1
+def update_confusion(conf: Dict[str, int], y_true: np.ndarray, y_pred: np.ndarray) -> None:
+    # y_true / y_pred are bool arrays over a batch of rows
+    conf["TP"] += int(np.count_nonzero(y_true & y_pred))
+    conf["FP"] += int(np.count_nonzero(~y_true & y_pred))
+    conf["FN"] += int(np.count_nonzero(y_true & ~y_pred))
+    conf["TN"] += int(np.count_nonzero(~y_true & ~y_pred))
 
 
 def confusion_metrics(conf: Dict[str, int]) -> Dict[str, float]:
@@ -339,21 +542,17 @@ def main() -> None:
         raise FileNotFoundError(f"Could not find {RESULTS_PATH} in the current folder.")
 
     ensure_dir(OUTPUT_DIR)
-    rows = read_jsonl(RESULTS_PATH)
 
-    # profile -> week -> list of scores
-    health_by_prof_week: Dict[str, Dict[int, List[float]]] = defaultdict(lambda: defaultdict(list))
-    lie_by_prof_week: Dict[str, Dict[int, List[float]]] = defaultdict(lambda: defaultdict(list))
-    extreme_by_prof_week: Dict[str, Dict[int, List[float]]] = defaultdict(lambda: defaultdict(list))
-    entropy_by_prof_week: Dict[str, Dict[int, List[float]]] = defaultdict(lambda: defaultdict(list))
-
-    # for global clouds
-    all_points_health_lie: List[Tuple[float, float]] = []
-    points_by_week: Dict[int, List[Tuple[float, float]]] = defaultdict(list)
-
-    # for flag rates
-    flags_sick_by_prof_week: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
-    flags_lie_by_prof_week: Dict[str, Dict[int, List[int]]] = defaultdict(lambda: defaultdict(list))
+    # Everything is accumulated chunk by chunk, so memory does not grow with the file:
+    # running stats and flag counts per (profile, week), confusion counts, and bounded
+    # reservoir samples of the raw scores for the boxplots and hexbins.
+    rng = np.random.default_rng(0)  # only used for reservoir sampling
+    metrics = ("health", "lie", "extreme")
+    stats: Dict[Tuple[str, int], Dict[str, RunningStats]] = defaultdict(lambda: {m: RunningStats() for m in metrics})
+    flag_counts: Dict[Tuple[str, int], np.ndarray] = defaultdict(lambda: np.zeros(3, dtype=np.int64))  # rows, sick, lying
+    box_samples: Dict[str, Reservoir] = {}  # profile -> (health, lie, extreme) rows
+    hex_all = Reservoir(RESERVOIR_SIZE, 2, rng)
+    hex_by_week: Dict[int, Reservoir] = {}  # week -> (health, lie) rows
 
     # NEW: confusion matrices (overall + per-week)
     conf_infection_overall = {"TP": 0, "FP": 0, "FN": 0, "TN": 0}
@@ -361,79 +560,69 @@ def main() -> None:
     conf_infection_by_week: Dict[int, Dict[str, int]] = defaultdict(lambda: {"TP": 0, "FP": 0, "FN": 0, "TN": 0})
     conf_lying_by_week: Dict[int, Dict[str, int]] = defaultdict(lambda: {"TP": 0, "FP": 0, "FN": 0, "TN": 0})
 
-    for r in rows:
-        if "name" not in r or "questionnaire_version" not in r:
-            continue
-        profile = str(r["name"])
-        week = int(r["questionnaire_version"])
-        answers = r.get("answers", {})
-        if not isinstance(answers, dict):
-            continue
-
+    n_rows = 0
+    for answers, weeks, row_profiles in iter_row_chunks(RESULTS_PATH):
+        n_rows += len(weeks)
         scores = compute_scores(answers)
-        hs = scores["health_score"]
-        ls = scores["lie_score"]
-        es = scores["extreme_score"]
-        en = scores["entropy"]
-
-        health_by_prof_week[profile][week].append(hs)
-        lie_by_prof_week[profile][week].append(ls)
-        extreme_by_prof_week[profile][week].append(es)
-        entropy_by_prof_week[profile][week].append(en)
+        points = np.column_stack((scores["health_score"], scores["lie_score"], scores["extreme_score"]))
+        pred_sick = is_flag_sick(scores["health_score"], scores["extreme_score"])
+        pred_lying = is_flag_lying(scores["lie_score"], scores["entropy"])
 
-        all_points_health_lie.append((hs, ls))
-        points_by_week[week].append((hs, ls))
-
-        pred_sick = is_flag_sick(hs, es)
-        pred_lying = is_flag_lying(ls, en)
-
-        flags_sick_by_prof_week[profile][week].append(int(pred_sick))
-        flags_lie_by_prof_week[profile][week].append(int(pred_lying))
+        groups = pd.DataFrame({"profile": row_profiles, "week": weeks})
+        for (prof, w), idx in groups.groupby(["profile", "week"]).indices.items():
+            key = (prof, int(w))
+            for metric, values in zip(metrics, points[idx].T):
+                stats[key][metric].update(values)
+            flag_counts[key] += (len(idx), np.count_nonzero(pred_sick[idx]), np.count_nonzero(pred_lying[idx]))
 
         # Ground truth inferred from profile name (your simulation design)
-        true_infected = ("Infected" in profile)
-        true_lying = ("Lying" in profile)
+        true_infected = np.zeros(len(weeks), dtype=bool)
+        true_lying = np.zeros(len(weeks), dtype=bool)
+        for prof, idx in groups.groupby("profile").indices.items():
+            true_infected[idx] = "Infected" in prof
+            true_lying[idx] = "Lying" in prof
+            box_samples.setdefault(prof, Reservoir(RESERVOIR_SIZE, 3, rng)).update(points[idx])
 
         update_confusion(conf_infection_overall, true_infected, pred_sick)
         update_confusion(conf_lying_overall, true_lying, pred_lying)
-        update_confusion(conf_infection_by_week[week], true_infected, pred_sick)
-        update_confusion(conf_lying_by_week[week], true_lying, pred_lying)
-
-    profiles = sorted(health_by_prof_week.keys())
+        hex_all.update(points[:, :2])
+        for w, idx in groups.groupby("week").indices.items():
+            w = int(w)
+            update_confusion(conf_infection_by_week[w], true_infected[idx], pred_sick[idx])
+            update_confusion(conf_lying_by_week[w], true_lying[idx], pred_lying[idx])
+            hex_by_week.setdefault(w, Reservoir(RESERVOIR_SIZE, 2, rng)).update(points[idx, :2])
+
+    profiles = sorted({prof for prof, _ in stats})
     if not profiles:
         print("No valid records found.")
         return
 
-    all_weeks = sorted({w for prof in profiles for w in health_by_prof_week[prof].keys()})
+    all_weeks = sorted({w for _, w in stats})
     if not all_weeks:
         print("No weeks found.")
         return
 
-    print(f"Loaded {len(rows)} rows from {RESULTS_PATH}")
+    print(f"Loaded {n_rows} rows from {RESULTS_PATH}")
     print(f"Profiles: {profiles}")
     print(f"Weeks: {all_weeks}")
 
+    def cell_stats(prof: str, w: int, metric: str) -> RunningStats:
+        # a (profile, week) cell with no rows reads as empty stats (nan mean/std)
+        return stats[(prof, w)][metric] if (prof, w) in stats else RunningStats()
+
+    def cell_rate(prof: str, w: int, flag: int) -> float:
+        counts = flag_counts.get((prof, w))
+        return float("nan") if counts is None else counts[flag] / counts[0]
+
     # ----------------------------
     # 1) Heatmaps: mean health and mean lie by (profile x week)
     # ----------------------------
-    health_matrix: List[List[float]] = []
-    lie_matrix: List[List[float]] = []
-    extreme_matrix: List[List[float]] = []
+    def profile_week_matrix(metric: str) -> np.ndarray:
+        return np.array([[cell_stats(p, w, metric).mean_std()[0] for w in all_weeks] for p in profiles])
 
-    for prof in profiles:
-        row_h = []
-        row_l = []
-        row_e = []
-        for w in all_weeks:
-            mh, _ = mean_std(health_by_prof_week[prof].get(w, []))
-            ml, _ = mean_std(lie_by_prof_week[prof].get(w, []))
-            me, _ = mean_std(extreme_by_prof_week[prof].get(w, []))
-            row_h.append(mh)
-            row_l.append(ml)
-            row_e.append(me)
-        health_matrix.append(row_h)
-        lie_matrix.append(row_l)
-        extreme_matrix.append(row_e)
+    health_matrix = profile_week_matrix("health")
+    lie_matrix = profile_week_matrix("lie")
+    extreme_matrix = profile_week_matrix("extreme")
 
     heatmap(
         matrix=health_matrix,
@@ -465,9 +654,9 @@ def main() -> None:
     extreme_series: Dict[str, List[Tuple[float, float]]] = {}
 
     for prof in profiles:
-        health_series[prof] = [mean_std(health_by_prof_week[prof].get(w, [])) for w in all_weeks]
-        lie_series[prof] = [mean_std(lie_by_prof_week[prof].get(w, [])) for w in all_weeks]
-        extreme_series[prof] = [mean_std(extreme_by_prof_week[prof].get(w, [])) for w in all_weeks]
+        health_series[prof] = [cell_stats(prof, w, "health").mean_std() for w in all_weeks]
+        lie_series[prof] = [cell_stats(prof, w, "lie").mean_std() for w in all_weeks]
+        extreme_series[prof] = [cell_stats(prof, w, "extreme").mean_std() for w in all_weeks]
 
     line_with_error(
         xs=all_weeks,
@@ -494,14 +683,10 @@ def main() -> None:
     # ----------------------------
     # 3) Distribution plots (boxplots) aggregated over ALL weeks (per profile)
     # ----------------------------
-    health_all_by_profile: Dict[str, List[float]] = {}
-    lie_all_by_profile: Dict[str, List[float]] = {}
-    extreme_all_by_profile: Dict[str, List[float]] = {}
-
-    for prof in profiles:
-        health_all_by_profile[prof] = [v for w in all_weeks for v in health_by_prof_week[prof].get(w, [])]
-        lie_all_by_profile[prof] = [v for w in all_weeks for v in lie_by_prof_week[prof].get(w, [])]
-        extreme_all_by_profile[prof] = [v for w in all_weeks for v in extreme_by_prof_week[prof].get(w, [])]
+    box_rows = {p: box_samples[p].sample() for p in profiles}
+    health_all_by_profile = {p: rows[:, 0] for p, rows in box_rows.items()}
+    lie_all_by_profile = {p: rows[:, 1] for p, rows in box_rows.items()}
+    extreme_all_by_profile = {p: rows[:, 2] for p, rows in box_rows.items()}
 
     boxplot_by_profile(
         values_by_profile=health_all_by_profile,
@@ -526,34 +711,39 @@ def main() -> None:
     # 4) Point-cloud density: health vs lie (overall and per week)
     # ----------------------------
     hexbin_health_vs_lie(
-        points=all_points_health_lie,
+        points=hex_all.sample(),
         title="Health vs Lie Score Density (All Profiles, All Weeks)",
         out_path=os.path.join(OUTPUT_DIR, "hexbin_health_vs_lie_all.png"),
     )
 
-    for w in all_weeks:
-        hexbin_health_vs_lie(
-            points=points_by_week[w],
-            title=f"Health vs Lie Score Density (Week {w})",
-            out_path=os.path.join(OUTPUT_DIR, f"hexbin_health_vs_lie_week_{w}.png"),
+    # one figure per week, independent of each other: render them in worker processes.
+    # spawn rather than fork, since forking after the parallel numba kernel has started
+    # its thread pool can hang the parent at exit. A spawned worker re-imports numba/pandas/
+    # matplotlib (~0.85 s, more than one hexbin takes), so one job or one core renders serially.
+    # weeks without a single finite (health, lie) point are skipped before dispatch
+    week_points = {w: hex_by_week[w].sample() for w in all_weeks}
+    week_jobs = [
+        (
+            week_points[w],
+            f"Health vs Lie Score Density (Week {w})",
+            os.path.join(OUTPUT_DIR, f"hexbin_health_vs_lie_week_{w}.png"),
         )
+        for w in all_weeks
+        if np.isfinite(week_points[w]).all(axis=1).any()
+    ]
+    workers = min(len(week_jobs), os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as ex:
+            list(ex.map(_render_hexbin, week_jobs))
+    else:
+        for job in week_jobs:
+            _render_hexbin(job)
 
     # ----------------------------
     # 5) Flag-rate trends (aggregate)
     # ----------------------------
-    sick_rate: Dict[str, List[float]] = {}
-    lie_rate: Dict[str, List[float]] = {}
-
-    for prof in profiles:
-        sick_rate[prof] = []
-        lie_rate[prof] = []
-        for w in all_weeks:
-            svals = flags_sick_by_prof_week[prof].get(w, [])
-            lvals = flags_lie_by_prof_week[prof].get(w, [])
-            sr = (sum(svals) / len(svals)) if svals else float("nan")
-            lr = (sum(lvals) / len(lvals)) if lvals else float("nan")
-            sick_rate[prof].append(sr)
-            lie_rate[prof].append(lr)
+    sick_rate: Dict[str, List[float]] = {p: [cell_rate(p, w, 1) for w in all_weeks] for p in profiles}
+    lie_rate: Dict[str, List[float]] = {p: [cell_rate(p, w, 2) for w in all_weeks] for p in profiles}
 
     stacked_flag_rates(
         weeks=all_weeks,
@@ -569,9 +759,9 @@ def main() -> None:
     print("\nAggregate summary (mean scores by profile, last week):")
     last_w = all_weeks[-1]
     for prof in profiles:
-        mh, sh = mean_std(health_by_prof_week[prof].get(last_w, []))
-        ml, sl = mean_std(lie_by_prof_week[prof].get(last_w, []))
-        me, se = mean_std(extreme_by_prof_week[prof].get(last_w, []))
+        mh, sh = cell_stats(prof, last_w, "health").mean_std()
+        ml, sl = cell_stats(prof, last_w, "lie").mean_std()
+        me, se = cell_stats(prof, last_w, "extreme").mean_std()
         print(
             f"{prof:18s}  week={last_w}  "
             f"health={mh:.3f}±{sh:.3f}  lie={ml:.3f}±{sl:.3f}  extreme={me:.3f}±{se:.3f}"
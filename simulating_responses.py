@@ -1,10 +1,39 @@
 #!/usr/bin/env python3
 
 from __future__ import annotations
-import json
+import multiprocessing
 import os
 import random
-from typing import Dict, Any, List
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from itertools import accumulate
+from typing import Dict, Any, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+
+    # one JSON line per call, newline included; a partial keeps the hot path free of Python frames
+    dumps_line = partial(orjson.dumps, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    import json
+
+    # one shared encoder, compact like orjson
+    _encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+    def dumps_line(obj: Any) -> bytes:
+        return (_encode(obj) + "\n").encode("utf-8")
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional; generate_liar_answers falls back to pure Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda fn: fn
 
 
 QUESTIONS = [
@@ -39,61 +68,120 @@ QUESTIONS = [
     ("q29", 3, True)
     ]  # Must match questionnaire qids
 
+# QUESTIONS as parallel columns, so the samplers index arrays instead of unpacking tuples
+QIDS = [qid for qid, _, _ in QUESTIONS]
+NORMS = np.array([norm for _, norm, _ in QUESTIONS], dtype=np.int8)
+IS_CONTRA = np.array([c for _, _, c in QUESTIONS], dtype=bool)
+
 RESULTS_PATH = "resultdata.jsonl"
+WRITE_BUFFER_BYTES = 1 << 20  # flush the output buffer once it grows past this
+SHARD_RUNS = 50_000  # runs per worker process; smaller simulations stay in-process (spawn costs more)
+# True: sample answers with the numpy batch samplers. False: use the scalar pattern functions
+# (liars via generate_liar_answers_batch, compiled with numba when available), e.g. to cross-check them
+VECTORIZED = True
+
+# PCG64 stream for all batched (numpy) sampling; seeded so a run is reproducible
+GEN = np.random.default_rng(69)
+
+LIKERT_VALUES = (1, 2, 3, 4, 5)
+
+# Likert weights (answers 1..5) per healthy norm, for the truthful patterns
+NORMAL_WEIGHTS = {
+    1: (50, 25, 15, 7, 3),
+    2: (25, 40, 20, 10, 5),
+    3: (5, 25, 40, 25, 5),
+    4: (5, 10, 20, 40, 25),
+    5: (3, 7, 15, 25, 50),
+}
+INFECTED_WEIGHTS = {
+    1: (3, 7, 15, 25, 50),
+    2: (5, 10, 20, 40, 25),
+    3: (30, 17, 6, 17, 30),
+    4: (25, 40, 20, 10, 5),
+    5: (50, 25, 15, 7, 3),
+}
 
-def append_jsonl(path: str, obj: Dict[str, Any]) -> None:
-    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(json.dumps(obj, ensure_ascii=False) + "\n")
 
-# ---- Pattern generators (return answer 1..5) ----
+def question_columns(questions: List[Tuple[str, int, bool]]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """(qids, norms, is_contra) of questions; the precomputed columns when it is QUESTIONS."""
+    if questions is QUESTIONS:
+        return QIDS, NORMS, IS_CONTRA
+    return (
+        [qid for qid, _, _ in questions],
+        np.array([norm for _, norm, _ in questions], dtype=np.int8),
+        np.array([c for _, _, c in questions], dtype=bool),
+    )
 
-def Normal_True(Questions):
-    ret = {}
-    for qid in Questions:
-        if (qid[1]==1):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[50, 25, 15, 7, 3], k=1)[0]
 
-        elif (qid[1]==2):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[25, 40, 20, 10, 5], k=1)[0]
+def answer_cdfs(weights_by_norm: Dict[int, Tuple[int, ...]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """(question columns, answer CDF over 1..5) for every norm that occurs in QUESTIONS."""
+    groups = []
+    for norm, weights in weights_by_norm.items():
+        cols = np.flatnonzero(NORMS == norm)
+        if cols.size:
+            cdf = np.cumsum(weights, dtype=np.float64)
+            groups.append((cols, cdf / cdf[-1]))
+    return groups
 
-        elif (qid[1]==4):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[5, 10, 20, 40, 25], k=1)[0]
 
-        elif (qid[1]==5):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[3, 7, 15, 25, 50], k=1)[0]
+NORMAL_CDFS = answer_cdfs(NORMAL_WEIGHTS)
+INFECTED_CDFS = answer_cdfs(INFECTED_WEIGHTS)
 
-        else:
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[5, 25, 40, 25, 5], k=1)[0]
-    print(ret)
-    return ret
 
-def Infected_True(Questions):
-    ret = {}
-    for qid in Questions:
-        if (qid[1]==1):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[3, 7, 15, 25, 50] , k=1)[0]
+def sample_answers(cdfs: List[Tuple[np.ndarray, np.ndarray]], n: int, rng: np.random.Generator = GEN) -> np.ndarray:
+    """Draw n respondents at once: (n, len(QUESTIONS)) int8 answers in 1..5."""
+    out = np.empty((n, len(QUESTIONS)), dtype=np.int8)
+    for cols, cdf in cdfs:
+        # one uniform per cell; its position in the norm's CDF is the answer index
+        out[:, cols] = np.searchsorted(cdf, rng.random((n, cols.size)), side="right") + 1
+    return out
 
-        elif (qid[1]==2):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[5, 10, 20, 40, 25], k=1)[0]
 
-        elif (qid[1]==4):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[25, 40, 20, 10, 5], k=1)[0]
+def append_many_jsonl(path: str, objs: Iterable[Dict[str, Any]]) -> int:
+    """Append objs as JSON lines through one file handle, flushing about every WRITE_BUFFER_BYTES."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    n = 0
+    with open(path, "ab") as f:
+        buf = bytearray()
+        for obj in objs:
+            buf += dumps_line(obj)
+            n += 1
+            if len(buf) > WRITE_BUFFER_BYTES:
+                f.write(buf)
+                buf.clear()
+        f.write(buf)
+    return n
 
-        elif (qid[1]==5):
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[50, 25, 15, 7, 3], k=1)[0]
 
-        else:
-            ret[qid[0]] = random.choices([1, 2, 3, 4, 5], weights=[30, 17, 6, 17, 30], k=1)[0]
-    return ret
+def append_jsonl(path: str, obj: Dict[str, Any]) -> None:
+    append_many_jsonl(path, [obj])
 
-import random
-from typing import Dict, Any, List, Tuple
+# ---- Weighted sampling (bisect on cumulative weights) ----
+# The tables are small (2-5 entries), so one rng.random() and a bisect is all a draw needs.
+
+@lru_cache(maxsize=None)
+def cumulative_weights(weights: Tuple[float, ...]) -> List[float]:
+    """Running totals of weights; cached per weight tuple since the simulator only uses a few."""
+    return list(accumulate(weights))
 
-# QUESTIONS: List[Tuple[qid, norm, contradictory]] already defined
 
-def clamp_1_5(x: int) -> int:
-    return 1 if x < 1 else 5 if x > 5 else x
+def weighted_choice(population: Sequence[Any], weights: Tuple[float, ...], rng) -> Any:
+    """Same as rng.choices(population, weights, k=1)[0]; rng is a random.Random or the random module.
+
+    One rng.random() and a bisect, without choices()' per-call argument checks and normalization.
+    """
+    cum = cumulative_weights(weights)
+    return population[bisect(cum, rng.random() * cum[-1])]
+
+# ---- Pattern generators (return answer 1..5) ----
+
+def Normal_True(Questions, rng=random):
+    qids, norms, _ = question_columns(Questions)
+    return {qid: weighted_choice(LIKERT_VALUES, NORMAL_WEIGHTS[norm], rng) for qid, norm in zip(qids, norms.tolist())}
+
+def Infected_True(Questions, rng=random):
+    qids, norms, _ = question_columns(Questions)
+    return {qid: weighted_choice(LIKERT_VALUES, INFECTED_WEIGHTS[norm], rng) for qid, norm in zip(qids, norms.tolist())}
 
 def sample_near(value: int, rng: random.Random, tight: bool = True) -> int:
     """
@@ -101,16 +189,16 @@ def sample_near(value: int, rng: random.Random, tight: bool = True) -> int:
     tight=True makes it stick closer (more realistic "strategic" answering).
     """
     if tight:
-        return rng.choices(
-            [clamp_1_5(value-1), value, clamp_1_5(value+1)],
-            weights=[20, 60, 20],
-            k=1
-        )[0]
-    return rng.choices(
-        [clamp_1_5(value-2), clamp_1_5(value-1), value, clamp_1_5(value+1), clamp_1_5(value+2)],
-        weights=[10, 20, 40, 20, 10],
-        k=1
-    )[0]
+        return weighted_choice(
+            [max(1, value - 1), value, min(5, value + 1)],
+            (20, 60, 20),
+            rng,
+        )
+    return weighted_choice(
+        [max(1, value - 2), max(1, value - 1), value, min(5, value + 1), min(5, value + 2)],
+        (10, 20, 40, 20, 10),
+        rng,
+    )
 
 def socially_desirable_answer(norm: int, rng: random.Random) -> int:
     """
@@ -120,13 +208,18 @@ def socially_desirable_answer(norm: int, rng: random.Random) -> int:
     # Mild centering: avoid extremes unless norm is extreme.
     if norm in (1, 5):
         return sample_near(norm, rng, tight=True)
-    return rng.choices([2, 3, 4], weights=[25, 50, 25], k=1)[0]
+    return weighted_choice([2, 3, 4], (25, 50, 25), rng)
 
 def plausible_random(rng: random.Random) -> int:
     """
     Human-like random (NOT uniform): middle answers more likely, extremes rarer.
     """
-    return rng.choices([1, 2, 3, 4, 5], weights=[8, 22, 40, 22, 8], k=1)[0]
+    return weighted_choice([1, 2, 3, 4, 5], (8, 22, 40, 22, 8), rng)
+
+
+STYLE_BIASES, STYLE_BIAS_WEIGHTS = (-1, 0, 1), (15, 70, 15)
+LIAR_STRATEGIES = ("social", "defensive", "overcompensate_contradict", "plausible_random")
+LIAR_STRATEGY_WEIGHTS = (45, 25, 20, 10)
 
 
 def generate_liar_answers(
@@ -139,19 +232,50 @@ def generate_liar_answers(
     infected=True means their "true" tendency might drift sick, but they attempt to mask it.
     """
     # Participant-level style bias (stable within one run; your longitudinal expansion will evolve later)
-    style_bias = rng.choices([-1, 0, 1], weights=[15, 70, 15], k=1)[0]
+    style_bias = weighted_choice(STYLE_BIASES, STYLE_BIAS_WEIGHTS, rng)
 
     # Pick a lying strategy for this run (you can later make it per-id stable if you want)
-    strategy = rng.choices(
-        ["social", "defensive", "overcompensate_contradict", "plausible_random"],
-        weights=[45, 25, 20, 10],
-        k=1
-    )[0]
+    strategy = weighted_choice(LIAR_STRATEGIES, LIAR_STRATEGY_WEIGHTS, rng)
+
+    return _liar_answers(question_columns(questions), style_bias, strategy, rng, infected)
+
+
+def generate_liar_answers_batch(
+    B: int,
+    questions: List[Tuple[str, int, bool]],
+    rng: random.Random,
+    infected: bool,
+) -> List[Dict[str, int]]:
+    """
+    generate_liar_answers for B respondents. Style biases and strategies for all of them
+    are drawn up front with one rng.choices call each, instead of two draws per respondent.
+    """
+    columns = question_columns(questions)
+    biases = rng.choices(STYLE_BIASES, STYLE_BIAS_WEIGHTS, k=B)
+    strategies = rng.choices(LIAR_STRATEGIES, LIAR_STRATEGY_WEIGHTS, k=B)
+    return [_liar_answers(columns, bias, strategy, rng, infected) for bias, strategy in zip(biases, strategies)]
+
+
+def _liar_answers(
+    columns: Tuple[List[str], np.ndarray, np.ndarray],
+    style_bias: int,
+    strategy: str,
+    rng: random.Random,
+    infected: bool,
+) -> Dict[str, int]:
+    """One liar's answers, given question_columns() and their already drawn style bias and strategy."""
+    qids, norms, contra = columns
+    if HAVE_NUMBA:
+        # same model, compiled; seeded from rng so a seeded rng still gives reproducible runs
+        answers = _generate_liar_numba(
+            norms, contra, infected, style_bias, LIAR_STRATEGIES.index(strategy), rng.getrandbits(32)
+        )
+        return dict(zip(qids, answers.tolist()))
 
     ret: Dict[str, int] = {}
 
-    for qid, norm, is_contra in questions:
-        norm_biased = clamp_1_5(norm + style_bias)
+    for qid, norm, is_contra in zip(qids, norms.tolist(), contra.tolist()):
+        norm_biased = min(5, max(1, norm + style_bias))
 
         if strategy == "social":
             # Keep non-contradictory close to norm; contradictories sometimes manipulated.
@@ -162,15 +286,15 @@ def generate_liar_answers(
                 if rng.random() < 0.60:
                     # move away from norm by 1-2
                     direction = rng.choice([-1, 1])
-                    step = rng.choices([1, 2], weights=[70, 30], k=1)[0]
-                    ans = clamp_1_5(norm_biased + direction * step)
+                    step = weighted_choice([1, 2], (70, 30), rng)
+                    ans = min(5, max(1, norm_biased + direction * step))
                 else:
                     ans = sample_near(norm_biased, rng, tight=True)
 
         elif strategy == "defensive":
             # Lots of 2-4 (avoid extremes), look consistent.
             if rng.random() < 0.80:
-                ans = rng.choices([2, 3, 4], weights=[30, 40, 30], k=1)[0]
+                ans = weighted_choice([2, 3, 4], (30, 40, 30), rng)
             else:
                 ans = sample_near(norm_biased, rng, tight=True)
 
@@ -180,8 +304,8 @@ def generate_liar_answers(
             if is_contra:
                 # deliberate deviation
                 direction = -1 if norm_biased >= 4 else (1 if norm_biased <= 2 else rng.choice([-1, 1]))
-                step = rng.choices([1, 2, 3], weights=[55, 30, 15], k=1)[0]
-                ans = clamp_1_5(norm_biased + direction * step)
+                step = weighted_choice([1, 2, 3], (55, 30, 15), rng)
+                ans = min(5, max(1, norm_biased + direction * step))
             else:
                 ans = sample_near(norm_biased, rng, tight=True)
 
@@ -194,23 +318,132 @@ def generate_liar_answers(
         if infected and rng.random() < 0.15:
             # push 1 step toward "sick extreme direction"
             if norm_biased >= 4:
-                ans = clamp_1_5(ans - 1)
+                ans = max(1, ans - 1)
             elif norm_biased <= 2:
-                ans = clamp_1_5(ans + 1)
+                ans = min(5, ans + 1)
             else:
-                ans = clamp_1_5(ans + rng.choice([-1, 1]))
+                ans = min(5, max(1, ans + rng.choice([-1, 1])))
 
         ret[qid] = ans
 
     return ret
 
 
-def Healthy_Lying(questions):
-    rng = random.Random()  # uses global randomness
+# CDFs of the liar model's weighted draws, as globals the numba kernel can see
+NEAR_TIGHT_CDF = np.cumsum([20, 60, 20]) / 100  # sample_near(tight=True): value -1, 0, +1
+SLIP_STEP_CDF = np.cumsum([70, 30]) / 100  # step 1, 2
+DEFENSIVE_CDF = np.cumsum([30, 40, 30]) / 100  # answer 2, 3, 4
+DEVIATE_STEP_CDF = np.cumsum([55, 30, 15]) / 100  # step 1, 2, 3
+PLAUSIBLE_CDF = np.cumsum([8, 22, 40, 22, 8]) / 100  # answer 1..5
+
+
+@njit(cache=True)
+def _choice_cdf(cdf: np.ndarray, u: float) -> int:
+    # index of the bin u falls into; the last CDF entry may round below 1.0
+    return min(np.searchsorted(cdf, u, side="right"), len(cdf) - 1)
+
+
+@njit(cache=True)
+def _generate_liar_numba(
+    norms: np.ndarray, is_contra: np.ndarray, infected: bool, style_bias: int, strategy: int, seed: int
+) -> np.ndarray:
+    """Compiled _liar_answers for one respondent (strategy indexes LIAR_STRATEGIES); same branches, numba's own RNG."""
+    np.random.seed(seed)
+    out = np.empty(len(norms), dtype=np.int8)
+
+    for i in range(len(norms)):
+        norm_biased = min(5, max(1, norms[i] + style_bias))
+        near = min(5, max(1, norm_biased - 1 + _choice_cdf(NEAR_TIGHT_CDF, np.random.random())))
+
+        if strategy == 0:  # social
+            if is_contra[i] and np.random.random() < 0.60:
+                direction = 1 if np.random.random() < 0.5 else -1
+                step = _choice_cdf(SLIP_STEP_CDF, np.random.random()) + 1
+                ans = min(5, max(1, norm_biased + direction * step))
+            else:
+                ans = near
+        elif strategy == 1:  # defensive
+            if np.random.random() < 0.80:
+                ans = _choice_cdf(DEFENSIVE_CDF, np.random.random()) + 2
+            else:
+                ans = near
+        elif strategy == 2:  # overcompensate_contradict
+            if is_contra[i]:
+                if norm_biased >= 4:
+                    direction = -1
+                elif norm_biased <= 2:
+                    direction = 1
+                else:
+                    direction = 1 if np.random.random() < 0.5 else -1
+                step = _choice_cdf(DEVIATE_STEP_CDF, np.random.random()) + 1
+                ans = min(5, max(1, norm_biased + direction * step))
+            else:
+                ans = near
+        else:  # plausible_random
+            ans = _choice_cdf(PLAUSIBLE_CDF, np.random.random()) + 1
+
+        if infected and np.random.random() < 0.15:
+            if norm_biased >= 4:
+                ans = max(1, ans - 1)
+            elif norm_biased <= 2:
+                ans = min(5, ans + 1)
+            else:
+                ans = min(5, max(1, ans + (1 if np.random.random() < 0.5 else -1)))
+
+        out[i] = ans
+    return out
+
+
+def _choice(values: Sequence[int], weights: Tuple[float, ...], shape, rng: np.random.Generator) -> np.ndarray:
+    p = np.asarray(weights, dtype=np.float64)
+    return rng.choice(np.asarray(values), size=shape, p=p / p.sum())
+
+
+def sample_liar_answers(n: int, rng: np.random.Generator = GEN, infected: bool = False) -> np.ndarray:
+    """
+    generate_liar_answers for n respondents at once: (n, len(QUESTIONS)) int8 answers in 1..5.
+    Every strategy is evaluated for all cells as whole-array ops, then each row keeps
+    the cells of the strategy it drew.
+    """
+    norms, is_contra = NORMS, IS_CONTRA
+    shape = (n, len(QUESTIONS))
+
+    style_bias = _choice([-1, 0, 1], (15, 70, 15), (n, 1), rng)
+    strategy = _choice([0, 1, 2, 3], (45, 25, 20, 10), (n, 1), rng)  # social, defensive, overcompensate, random
+    norm_biased = np.clip(norms + style_bias, 1, 5)
+
+    def near(values: np.ndarray) -> np.ndarray:
+        # sample_near(value, tight=True) for every cell
+        return np.clip(values + _choice([-1, 0, 1], (20, 60, 20), shape, rng), 1, 5)
+
+    coin = rng.choice([-1, 1], size=shape)
+
+    slip = is_contra & (rng.random(shape) < 0.60)
+    social = np.where(slip, np.clip(norm_biased + coin * _choice([1, 2], (70, 30), shape, rng), 1, 5), near(norm_biased))
+
+    defensive = np.where(rng.random(shape) < 0.80, _choice([2, 3, 4], (30, 40, 30), shape, rng), near(norm_biased))
+
+    direction = np.where(norm_biased >= 4, -1, np.where(norm_biased <= 2, 1, coin))
+    deviate = np.clip(norm_biased + direction * _choice([1, 2, 3], (55, 30, 15), shape, rng), 1, 5)
+    overcompensate = np.where(is_contra, deviate, near(norm_biased))
+
+    plausible = _choice([1, 2, 3, 4, 5], (8, 22, 40, 22, 8), shape, rng)
+
+    ans = np.choose(strategy, [social, defensive, overcompensate, plausible])
+
+    if infected:
+        # same partial "sick" drift as the scalar model, one step on ~15% of items
+        toward_sick = np.where(norm_biased >= 4, -1, np.where(norm_biased <= 2, 1, rng.choice([-1, 1], size=shape)))
+        ans = np.where(rng.random(shape) < 0.15, np.clip(ans + toward_sick, 1, 5), ans)
+
+    return ans.astype(np.int8)
+
+
+# Scalar patterns take (questions, rng); rng defaults to the global random module state.
+def Healthy_Lying(questions, rng=random):
     return generate_liar_answers(questions, rng=rng, infected=False)
 
-def Infected_Lying(questions):
-    rng = random.Random()
+def Infected_Lying(questions, rng=random):
     return generate_liar_answers(questions, rng=rng, infected=True)
 
 
@@ -221,29 +454,89 @@ PATTERNS = {
     "Infected-Lying": Infected_Lying,        # updated
 }
 
+# Patterns that can be sampled for many respondents in one call: (n, rng) -> (n, Q) answers
+BATCH_PATTERNS = {
+    "Healthy-Truthful": lambda n, rng: sample_answers(NORMAL_CDFS, n, rng),
+    "Infected-Truthful": lambda n, rng: sample_answers(INFECTED_CDFS, n, rng),
+    "Healthy-Lying": lambda n, rng: sample_liar_answers(n, rng, infected=False),
+    "Infected-Lying": lambda n, rng: sample_liar_answers(n, rng, infected=True),
+}
+
 
 
-def simulate_one_run(pattern_name: str, rng: random.Random) -> Dict[str, Any]:
-    pattern_fn = PATTERNS[pattern_name]
-    answers = pattern_fn(QUESTIONS)
+ID_LOW, ID_HIGH = 10000000, 99999999  # respondent ids are random 8-digit numbers
 
+
+def make_record(pattern_name: str, answers: Dict[str, int], record_id: int) -> Dict[str, Any]:
     return {
-        "id": random.randint(10000000, 99999999),
+        "id": record_id,
         "name": pattern_name,
         "answers": answers,
         "questionnaire_version": 1,
     }
 
 
+def simulate_one_run(pattern_name: str, rng: random.Random) -> Dict[str, Any]:
+    pattern_fn = PATTERNS[pattern_name]
+    answers = pattern_fn(QUESTIONS, rng)
+    # randrange directly: randint only adds a wrapper call to it
+    return make_record(pattern_name, answers, rng.randrange(ID_LOW, ID_HIGH + 1))
+
+
+PATTERN_CYCLE: List[str] = ["Healthy-Truthful", "Healthy-Lying", "Infected-Truthful", "Infected-Lying"]
+
+
+def simulate_records(
+    total_runs: int, rng: random.Random, gen: np.random.Generator, vectorized: bool = VECTORIZED
+) -> Iterator[Dict[str, Any]]:
+    """
+    total_runs records; pattern picks come from rng, ids from gen.
+    vectorized=True draws answers with BATCH_PATTERNS on gen, otherwise with the scalar patterns on rng.
+    """
+    pattern_names = rng.choices(PATTERN_CYCLE, weights=(90, 9.7, 0.2, 0.1), k=total_runs)
+    ids = gen.integers(ID_LOW, ID_HIGH, size=total_runs, endpoint=True).tolist()
+
+    # Patterns sampled for all their runs in one go; anything else calls PATTERNS per run
+    batched: Dict[str, Iterator[Dict[str, int]]] = {}
+    if vectorized:
+        for name, sampler in BATCH_PATTERNS.items():
+            # answers are turned into dicts only when written
+            rows = sampler(pattern_names.count(name), gen).tolist()
+            batched[name] = (dict(zip(QIDS, row)) for row in rows)
+    else:
+        for name, infected in (("Healthy-Lying", False), ("Infected-Lying", True)):
+            batched[name] = iter(generate_liar_answers_batch(pattern_names.count(name), QUESTIONS, rng, infected))
+
+    for pattern_name, record_id in zip(pattern_names, ids):
+        if pattern_name in batched:
+            answers = next(batched[pattern_name])
+        else:
+            answers = PATTERNS[pattern_name](QUESTIONS, rng)
+        yield make_record(pattern_name, answers, record_id)
+
+
+def _simulate_shard(args: Tuple[int, int]) -> bytes:
+    # top-level so ProcessPoolExecutor can pickle it; returns the shard's encoded JSON lines
+    size, seed = args
+    records = simulate_records(size, random.Random(seed), np.random.default_rng(seed))
+    return b"".join(map(dumps_line, records))
+
+
 def main() -> None:
-    rng = random.Random(69)  # deterministic; change/remove for different runs
-    pattern_cycle: List[str] = ["Healthy-Truthful", "Healthy-Lying", "Infected-Truthful", "Infected-Lying"]
+    rng = random.Random(69)  # deterministic, like GEN; change/remove the seed for different runs
 
     total_runs = 15000
-    for i in range(total_runs):
-        pattern_name = pattern_cycle[random.choices([0, 1, 2, 3], weights=[90, 9.7, 0.2, 0.1], k=1)[0]]
-        record = simulate_one_run(pattern_name, rng)
-        append_jsonl(RESULTS_PATH, record)
+    if total_runs <= SHARD_RUNS:
+        append_many_jsonl(RESULTS_PATH, simulate_records(total_runs, rng, GEN))
+    else:
+        # runs are independent: simulate fixed-size shards in worker processes, each with its own
+        # seed drawn from rng, and append them in shard order so the file is the same on any core count
+        sizes = [min(SHARD_RUNS, total_runs - start) for start in range(0, total_runs, SHARD_RUNS)]
+        jobs = [(size, rng.getrandbits(64)) for size in sizes]
+        os.makedirs(os.path.dirname(RESULTS_PATH) or ".", exist_ok=True)
+        with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as ex, open(RESULTS_PATH, "ab") as f:
+            for chunk in ex.map(_simulate_shard, jobs):
+                f.write(chunk)
 
     print(f"Wrote {total_runs} simulated runs to {RESULTS_PATH}.")
 
@@ -1,15 +1,27 @@
 from __future__ import annotations
 
-import json
 import math
 import os
-import statistics
-from collections import Counter, defaultdict
-from typing import Dict, Any, List
-import matplotlib.pyplot as plt
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Any, List, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+try:
+    from orjson import JSONDecodeError, loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    from json import JSONDecodeError, loads
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow is optional; without it the results are parsed from JSONL every run
+    pa = None
 
 
 RESULTS_PATH = "resultdata.jsonl"
+ARROW_PATH = "resultdata.arrow"  # columnar int8 cache of RESULTS_PATH's answers (needs pyarrow)
 OUTPUT_DIR = "plots"
 
 LIKERT_LABELS = {
@@ -54,42 +66,62 @@ QUESTIONS = [
 
 def read_jsonl(path: str) -> List[Dict[str, Any]]:
     rows: List[Dict[str, Any]] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for line_no, line in enumerate(f, start=1):
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                rows.append(json.loads(line))
-            except json.JSONDecodeError as e:
-                raise ValueError(f"Invalid JSON on line {line_no}: {e}") from e
+    # one bulk read; lines stay bytes, which loads parses without a str decode
+    with open(path, "rb") as f:
+        lines = f.read().splitlines()
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            rows.append(loads(line))
+        except JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_no}: {e}") from e
     return rows
 
 
-def safe_stdev(values: List[int]) -> float:
-    """
-    Sample standard deviation if n>=2; otherwise return 0.0
-    """
-    if len(values) < 2:
-        return 0.0
-    return float(statistics.stdev(values))
+LIKERT_VALUES = np.arange(1, 6)
+
+_plt = None
 
 
-def mean(values: List[int]) -> float:
-    if not values:
-        return float("nan")
-    return float(statistics.mean(values))
+def pyplot():
+    """matplotlib.pyplot on the Agg backend, imported on first use so stats-only callers skip its startup cost."""
+    global _plt
+    if _plt is None:
+        import matplotlib
 
+        matplotlib.use("Agg")  # plots are only written to files; skip GUI backend setup
+        import matplotlib.pyplot as plt
 
-def median(values: List[int]) -> float:
-    if not values:
-        return float("nan")
-    return float(statistics.median(values))
+        _plt = plt
+    return _plt
 
 
-def collect_answers(rows: List[Dict[str, Any]]) -> Dict[str, List[int]]:
+def histogram(values: np.ndarray) -> np.ndarray:
+    """Counts of answers 1..5 (index 0 is answer 1)."""
+    return np.bincount(values, minlength=6)[1:6]
+
+
+def histogram_stats(hist: np.ndarray) -> Tuple[int, float, float, float]:
+    """
+    (n, mean, median, sample std dev) of the answers counted in hist, in O(5).
+    Matches statistics.mean/median/stdev; std dev is 0.0 for n<2, mean/median nan for n==0.
+    """
+    n = int(hist.sum())
+    if n == 0:
+        return 0, float("nan"), float("nan"), 0.0
+    avg = float(hist @ LIKERT_VALUES) / n
+    # median: average of the two middle order statistics, read off the cumulative counts
+    cum = np.cumsum(hist)
+    lo, hi = np.searchsorted(cum, [(n - 1) // 2, n // 2], side="right") + 1
+    med = (lo + hi) / 2
+    sd = math.sqrt(float(hist @ (LIKERT_VALUES - avg) ** 2) / (n - 1)) if n >= 2 else 0.0
+    return n, avg, float(med), sd
+
+
+def collect_answers(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
     """
-    Returns dict: question_id -> list of numeric answers (1..5)
+    Returns dict: question_id -> int8 array of numeric answers (1..5)
     """
     by_q: Dict[str, List[int]] = defaultdict(list)
 
@@ -103,31 +135,91 @@ def collect_answers(rows: List[Dict[str, Any]]) -> Dict[str, List[int]]:
             if isinstance(val, int) and 1 <= val <= 5:
                 by_q[str(qid)].append(val)
 
-    return dict(by_q)
+    return {qid: np.asarray(values, dtype=np.int8) for qid, values in by_q.items()}
 
 
-def plot_distribution(qid: str, values: List[int], output_dir: str) -> str:
-    counts = Counter(values)
+def answer_table(rows: List[Dict[str, Any]]) -> "pa.Table":
+    """
+    One nullable int8 column per question, one row per run; null where collect_answers
+    would skip the answer, so dropping nulls gives back its per-question arrays.
+    """
+    # per question: the row indices and values of its valid answers, scattered into columns below
+    found: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+    for i, r in enumerate(rows):
+        answers = r.get("answers", {})
+        if not isinstance(answers, dict):
+            continue
+
+        for qid, val in answers.items():
+            if isinstance(val, int) and 1 <= val <= 5:
+                idx, values = found[str(qid)]
+                idx.append(i)
+                values.append(val)
+
+    columns = {}
+    for qid, (idx, values) in found.items():
+        col = np.zeros(len(rows), dtype=np.int8)
+        col[idx] = values
+        missing = np.ones(len(rows), dtype=bool)
+        missing[idx] = False
+        columns[qid] = pa.array(col, mask=missing)
+    return pa.table(columns)
+
+
+def load_answers(path: str, cache_path: str) -> Tuple[int, Dict[str, np.ndarray]]:
+    """
+    (number of runs, collect_answers() of them) for the JSONL at path.
+    With pyarrow the answers are also kept as an Arrow IPC file at cache_path, stamped with
+    path's size and mtime; later calls memory-map it instead of parsing JSON until path changes.
+    """
+    if pa is None:
+        rows = read_jsonl(path)
+        return len(rows), collect_answers(rows)
+
+    st = os.stat(path)
+    stamp = {b"source_size": str(st.st_size).encode(), b"source_mtime_ns": str(st.st_mtime_ns).encode()}
+
+    table = None
+    if os.path.exists(cache_path):
+        try:
+            with pa.memory_map(cache_path) as source:
+                cached = pa.ipc.open_file(source).read_all()
+        except pa.ArrowInvalid:  # not a readable Arrow file; rebuild it below
+            cached = None
+        if cached is not None and cached.schema.metadata == stamp:
+            table = cached
+
+    if table is None:
+        table = answer_table(read_jsonl(path)).replace_schema_metadata(stamp)
+        tmp_path = cache_path + ".tmp"
+        with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, cache_path)  # readers never see a half-written cache
+
+    by_q = {qid: table.column(qid).drop_null().to_numpy() for qid in table.column_names}
+    return table.num_rows, by_q
+
+
+def plot_distribution(qid: str, values: np.ndarray, output_dir: str, ax: Axes) -> str:
+    """Draws the histogram on ax (cleared first, so one figure serves every question) and saves it."""
     xs = [1, 2, 3, 4, 5]
-    ys = [counts.get(x, 0) for x in xs]
+    ys = histogram(values).tolist()
     xlabels = [LIKERT_LABELS[x] for x in xs]
 
-    plt.figure()
-    plt.bar(xs, ys)
-    plt.xticks(xs, xlabels)
-    plt.ylabel("Count")
-    plt.title(f"Response distribution: {qid}")
+    ax.clear()
+    ax.bar(xs, ys)
+    ax.set_xticks(xs, xlabels)
+    ax.set_ylabel("Count")
+    ax.set_title(f"Response distribution: {qid}")
 
     # annotate bar heights
     for x, y in zip(xs, ys):
-        plt.text(x, y + 0.02 * max(ys + [1]), str(y), ha="center", va="bottom")
+        ax.text(x, y + 0.02 * max(ys + [1]), str(y), ha="center", va="bottom")
 
     os.makedirs(output_dir, exist_ok=True)
     out_path = os.path.join(output_dir, f"{qid}.png")
-    plt.tight_layout()
-    plt.show()
-    #plt.savefig(out_path, dpi=200)
-    #plt.close()
+    ax.figure.tight_layout()
+    ax.figure.savefig(out_path, dpi=200)
     return out_path
 
 
@@ -135,28 +227,26 @@ def main() -> None:
     if not os.path.exists(RESULTS_PATH):
         raise FileNotFoundError(f"Could not find {RESULTS_PATH} in the current folder.")
 
-    rows = read_jsonl(RESULTS_PATH)
-    by_q = collect_answers(rows)
+    n_runs, by_q = load_answers(RESULTS_PATH, ARROW_PATH)
 
     if not by_q:
         print("No valid answers found in results file.")
         return
 
-    print(f"Loaded {len(rows)} runs from {RESULTS_PATH}.")
+    print(f"Loaded {n_runs} runs from {RESULTS_PATH}.")
     print(f"Found {len(by_q)} questions.\n")
 
+    plt = pyplot()
+    fig, ax = plt.subplots()
+
     # Optional: stable ordering by qid
     for qid in sorted(by_q.keys()):
         values = by_q[qid]
-        n = len(values)
-
-        avg = mean(values)
-        med = median(values)
-        sd = safe_stdev(values)
+        hist = histogram(values)
+        n, avg, med, sd = histogram_stats(hist)
 
         # Distribution
-        counts = Counter(values)
-        dist_str = ", ".join(f"{k}:{counts.get(k,0)}" for k in [1,2,3,4,5])
+        dist_str = ", ".join(f"{k}:{count}" for k, count in zip(LIKERT_VALUES, hist.tolist()))
 
         print(f"Question: {qid}")
         print(f"  N = {n}")
@@ -165,9 +255,11 @@ def main() -> None:
         print(f"  Median  = {med:.3f}")
         print(f"  Std dev = {sd:.3f}")
 
-        out_path = plot_distribution(qid, values, OUTPUT_DIR)
+        out_path = plot_distribution(qid, values, OUTPUT_DIR, ax)
         print(f"  Plot saved to: {out_path}\n")
 
+    plt.close(fig)
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file